@@ -1,113 +1,399 @@
 # app.py
 import streamlit as st
+import streamlit.components.v1 as components
 from pathlib import Path
 import os
-import pandas as pd
 from dotenv import load_dotenv
 from datetime import datetime
 import random
+import asyncio
+import time
+import threading
+import hashlib
+import logging
 
-from agno.agent import Agent
-from agno.models.groq import Groq
-from agno.team.team import Team
-from agno.tools.googlesearch import GoogleSearchTools
-from agno.tools.hackernews import HackerNewsTools
+logger = logging.getLogger(__name__)
 
 # --- Load environment variables ---
 load_dotenv()
 os.environ["GROQ_API_KEY"] = os.getenv("GROQ_API_KEY")
 
 # --- Optional: path to example dataset ---
-data_path = Path(__file__).parent / "sample_air_quality.csv"
+data_path = Path(__file__).parent / "sample_air_quality.parquet"
 if not data_path.exists():
-    df_mock = pd.DataFrame({
+    import pandas as pd
+    pd.DataFrame({
         "Year": [2021, 2022, 2023],
         "PM2.5": [55, 48, 42],
         "CO2": [400, 395, 390]
-    })
-    df_mock.to_csv(data_path, index=False)
+    }).to_parquet(data_path, compression="zstd", index=False)
 
-# --- Agent Definitions ---
-news_analyst = Agent(
-    name="📰 News Analyst",
-    role="Track recent news on sustainability initiatives",
-    model=Groq(id="qwen/qwen3-32b"),
-    tools=[GoogleSearchTools()],
-    instructions="Find the most relevant city-level green projects from the past year and summarize key findings.",
-    show_tool_calls=True,
-    markdown=True,
-)
+# --- Dataset Analysis ---
+@st.cache_data
+def _load_df(path, mtime):
+    import pandas as pd
+    return pd.read_parquet(path)
 
-def analyze_dataset():
-    df = pd.read_csv(data_path)
-    summary = df.describe(include='all').to_string()
+@st.cache_data
+def _aggregate(path, mtime):
+    df = _load_df(path, mtime)
+    columns = [c for c in ("PM2.5", "CO2") if c in df.columns]
+    return df[columns].agg(["mean", "min", "max", "std"]).round(2)
+
+@st.cache_data
+def _summarize(path, mtime) -> str:
+    stats = _aggregate(path, mtime)
     trends = []
-    if "PM2.5" in df.columns:
-        trends.append(f"🌫️ **Average PM2.5:** {df['PM2.5'].mean():.2f} μg/m³")
-    if "CO2" in df.columns:
-        trends.append(f"🌍 **Average CO2:** {df['CO2'].mean():.2f} ppm")
+    if "PM2.5" in stats.columns:
+        trends.append(f"🌫️ **Average PM2.5:** {stats.at['mean', 'PM2.5']:.2f} μg/m³")
+    if "CO2" in stats.columns:
+        trends.append(f"🌍 **Average CO2:** {stats.at['mean', 'CO2']:.2f} ppm")
     trends_text = "\n".join(trends)
-    return f"📊 **Dataset Summary:**\n```\n{summary}\n```\n\n**Environmental Trends:**\n{trends_text}"
-
-data_analyst = Agent(
-    name="📊 Data Analyst",
-    role="Analyze environmental datasets",
-    model=Groq(id="qwen/qwen3-32b"),
-    tools=[],
-    instructions="Read the provided air quality dataset and summarize trends.",
-    show_tool_calls=False,
-    markdown=True,
-)
+    return f"📊 **Dataset Summary:**\n```\n{stats.to_string()}\n```\n\n**Environmental Trends:**\n{trends_text}"
 
-policy_reviewer = Agent(
-    name="📜 Policy Reviewer",
-    role="Summarize government sustainability policies",
-    model=Groq(id="qwen/qwen3-32b"),
-    tools=[GoogleSearchTools()],
-    instructions="Find official city government sources and summarize their recent sustainability policy changes.",
-    show_tool_calls=True,
-    markdown=True,
-)
+@st.cache_data
+def _describe(path, mtime):
+    return _load_df(path, mtime).select_dtypes("number").describe().round(2)
 
-innovation_scout = Agent(
-    name="💡 Innovations Scout",
-    role="Discover cutting-edge green tech ideas",
-    model=Groq(id="qwen/qwen3-32b"),
-    tools=[HackerNewsTools(), GoogleSearchTools()],
-    instructions="Search for innovative urban sustainability technologies and describe them in detail.",
-    show_tool_calls=True,
-    markdown=True,
-)
+def analyze_dataset():
+    # Cached on the file's mtime so edits to the dataset invalidate the summary
+    return _summarize(str(data_path), data_path.stat().st_mtime)
 
-# --- Task Force Team ---
-sustainability_team = Team(
-    name="🌐 Sustainability Task Force",
-    mode="collaborate",
-    model=Groq(id="qwen/qwen3-32b"),
-    members=[news_analyst, data_analyst, policy_reviewer, innovation_scout],
-    instructions=["Collaborate to produce a comprehensive sustainability proposal for the city."],
-    show_tool_calls=True,
-    markdown=True,
-)
+def dataset_aggregates():
+    return _aggregate(str(data_path), data_path.stat().st_mtime)
+
+def dataset_stats():
+    return _describe(str(data_path), data_path.stat().st_mtime)
+
+# --- Shared HTTP Client ---
+# One pooled keep-alive client so every model call reuses a warm TLS session to the Groq API
+@st.cache_resource
+def _http():
+    import httpx
+    return httpx.Client(
+        limits=httpx.Limits(max_keepalive_connections=20, max_connections=100, keepalive_expiry=30.0),
+        http2=True,
+        timeout=60,
+    )
+
+# --- Agent Definitions ---
+# Agents keep per-run state (run id, messages, memory), so each mission builds its own;
+# the expensive part, the HTTP connection pool, is shared through _http()
+def build_agent(agent_key):
+    from agno.agent import Agent
+    from agno.models.groq import Groq
+    from agno.tools.googlesearch import GoogleSearchTools
+    from agno.tools.hackernews import HackerNewsTools
+    specs = {
+        "news": dict(
+            name="📰 News Analyst",
+            role="Track recent news on sustainability initiatives",
+            tools=[GoogleSearchTools],
+            instructions="Find the most relevant city-level green projects from the past year and summarize key findings.",
+            show_tool_calls=True,
+        ),
+        "policy": dict(
+            name="📜 Policy Reviewer",
+            role="Summarize government sustainability policies",
+            tools=[GoogleSearchTools],
+            instructions="Find official city government sources and summarize their recent sustainability policy changes.",
+            show_tool_calls=True,
+        ),
+        "innovation": dict(
+            name="💡 Innovations Scout",
+            role="Discover cutting-edge green tech ideas",
+            tools=[HackerNewsTools, GoogleSearchTools],
+            instructions="Search for innovative urban sustainability technologies and describe them in detail.",
+            show_tool_calls=True,
+        ),
+        "synthesizer": dict(
+            name="🌐 Task Force Synthesizer",
+            role="Merge operative reports into one proposal",
+            tools=[],
+            instructions="Combine the operatives' reports into a comprehensive sustainability proposal for the city.",
+            show_tool_calls=False,
+        ),
+    }
+    spec = specs[agent_key]
+    return Agent(
+        model=Groq(id="qwen/qwen3-32b", http_client=_http()),
+        tools=[tool() for tool in spec.pop("tools")],
+        markdown=True,
+        **spec,
+    )
+
+# --- Operative Lookup ---
+# Radio label -> (agent key, banner CSS class, banner icon); the radio options are read from its keys
+AGENT_MAP = {
+    "📰 News Analyst": ("news", "news-analyst-banner", "📰"),
+    "📊 Data Analyst": ("data", "data-analyst-banner", "📊"),
+    "📜 Policy Reviewer": ("policy", "policy-reviewer-banner", "📜"),
+    "💡 Innovations Scout": ("innovation", "innovation-scout-banner", "💡"),
+    "🌐 Full Task Force": ("team", "sustainability-team-banner", "🌐"),
+}
+
+# --- Task Force Synthesis ---
+TASKFORCE_OPERATIVES = ("news", "policy", "innovation")
+
+async def brief_taskforce(topic, emb, cached):
+    # Operatives are network-bound, so run them concurrently and synthesize once;
+    # `cached` holds their cache lookups, so only misses hit the API
+    dataset_report = analyze_dataset()
+    reports = {key: cached[key] for key in TASKFORCE_OPERATIVES}
+    missing = [key for key in TASKFORCE_OPERATIVES if reports[key] is None]
+    # A failing operative (tool error, rate limit) is skipped rather than discarding the others' reports
+    # Sync run() in worker threads so the models use the pooled httpx.Client; arun() would need an AsyncClient
+    results = await asyncio.gather(
+        *(asyncio.to_thread(build_agent(key).run, topic) for key in missing),
+        return_exceptions=True,
+    )
+    failed = []
+    for key, result in zip(missing, results):
+        if isinstance(result, BaseException):
+            logger.warning("Task Force operative %r failed", key, exc_info=result)
+            failed.append(key)
+        elif result and getattr(result, "content", None):
+            reports[key] = result.content
+            cache_store(key, topic, emb, result.content)
+        else:
+            failed.append(key)
+    if failed:
+        labels = {key: label for label, (key, _, _) in AGENT_MAP.items()}
+        st.warning(f"⚠️ No report from: {', '.join(labels[key] for key in failed)}")
+    sections = [reports[key] for key in TASKFORCE_OPERATIVES if reports[key]]
+    prompt = f"Mission target: {topic}\n\nSynthesize:\n" + "\n---\n".join(sections + [dataset_report])
+    return prompt, bool(sections)
+
+# --- Streaming Output ---
+# Re-rendering on every token is quadratic in the answer length, so flush at most this often
+STREAM_FLUSH_INTERVAL = 0.05
+
+def stream_report(chunks, placeholder, banner_prefix, banner_suffix):
+    buf = ""
+    last_flush = 0.0
+    for chunk in chunks:
+        delta = getattr(chunk, "content", None)
+        if not isinstance(delta, str):
+            continue
+        buf += delta
+        now = time.monotonic()
+        if now - last_flush >= STREAM_FLUSH_INTERVAL:
+            placeholder.markdown(banner_prefix + buf + banner_suffix, unsafe_allow_html=True)
+            last_flush = now
+    return buf
+
+# --- Report Rendering ---
+@st.cache_resource
+def get_markdown_parser():
+    from markdown_it import MarkdownIt
+    return MarkdownIt("commonmark", {"html": True}).enable("table")
+
+def render_report(agent_key, topic, content, banner_prefix, banner_suffix):
+    # Parse the finished report to HTML once; the last one is kept so reruns redraw it without re-parsing
+    # A fresh run for the same operative and topic can produce new text, so the content is checked too
+    last = st.session_state.get("last_report")
+    if last is None or last["key"] != (agent_key, topic) or last["content"] != content:
+        html = banner_prefix + get_markdown_parser().render(content) + banner_suffix
+        last = {"key": (agent_key, topic), "content": content, "html": html}
+        st.session_state.last_report = last
+    return last["html"]
+
+# --- Semantic Response Cache ---
+# Near-duplicate topics (cosine similarity >= threshold) for the same operative reuse the earlier report
+CACHE_THRESHOLD = 0.85
+# Past this many entries the linear scan gives way to an HNSW approximate nearest-neighbour index
+ANN_MIN_ENTRIES = 1_000
+ANN_MAX_ELEMENTS = 100_000
+# Cache arrays are preallocated and doubled when full, so appends are amortized O(1)
+CACHE_INITIAL_CAPACITY = 64
+
+@st.cache_resource
+def get_encoder():
+    from sentence_transformers import SentenceTransformer
+    return SentenceTransformer("sentence-transformers/all-MiniLM-L6-v2")
+
+@st.cache_resource
+def get_cache():
+    import numpy as np
+    return {
+        "size": 0,
+        "embs": np.empty((CACHE_INITIAL_CAPACITY, 384), dtype=np.float32),
+        "keys": np.empty(CACHE_INITIAL_CAPACITY, dtype=object),
+        "resps": [],
+        "ann": None,
+        "lock": threading.Lock(),
+    }
+
+def _grown(arr, capacity):
+    import numpy as np
+    out = np.empty((capacity,) + arr.shape[1:], dtype=arr.dtype)
+    out[:len(arr)] = arr
+    return out
+
+def embed_topic(topic):
+    import numpy as np
+    return get_encoder().encode(topic, normalize_embeddings=True, convert_to_numpy=True).astype(np.float32)
+
+def _build_ann(embs):
+    import numpy as np
+    import hnswlib
+    index = hnswlib.Index(space="cosine", dim=384)
+    index.init_index(max_elements=max(ANN_MAX_ELEMENTS, 2 * len(embs)), ef_construction=200, M=16)
+    index.set_ef(50)
+    index.add_items(embs, np.arange(len(embs)))
+    return index
+
+def _ann_lookup(cache, agent_key, emb):
+    keys = cache["keys"]
+    try:
+        labels, dists = cache["ann"].knn_query(emb, k=1, filter=lambda label: keys[label] == agent_key)
+    except RuntimeError:
+        # Raised when no entry passes the filter, i.e. nothing cached for this operative
+        return None
+    # hnswlib's cosine space returns 1 - similarity
+    if 1.0 - dists[0][0] >= CACHE_THRESHOLD:
+        return cache["resps"][int(labels[0][0])]
+    return None
+
+def _memory_lookup_many(agent_keys, emb):
+    import numpy as np
+    cache = get_cache()
+    with cache["lock"]:
+        n = cache["size"]
+        if not n:
+            return {key: None for key in agent_keys}
+        if cache["ann"] is not None:
+            return {key: _ann_lookup(cache, key, emb) for key in agent_keys}
+        # Embeddings are L2-normalized, so the dot product is the cosine similarity;
+        # a single product over the cache is shared by every operative's lookup
+        sims = cache["embs"][:n] @ emb
+        keys = cache["keys"][:n]
+        found = {}
+        for key in agent_keys:
+            masked = np.where(keys == key, sims, -1.0)
+            best = int(masked.argmax())
+            found[key] = cache["resps"][best] if masked[best] >= CACHE_THRESHOLD else None
+    return found
+
+def _memory_store(agent_key, emb, content):
+    cache = get_cache()
+    with cache["lock"]:
+        n = cache["size"]
+        ann = cache["ann"]
+        if n == len(cache["keys"]):
+            # Once the HNSW index exists it holds the vectors, so only the keys keep growing
+            for name in ("keys",) if ann is not None else ("embs", "keys"):
+                cache[name] = _grown(cache[name], 2 * n)
+        cache["keys"][n] = agent_key
+        cache["resps"].append(content)
+        cache["size"] = n + 1
+        if ann is not None:
+            if ann.get_current_count() >= ann.get_max_elements():
+                ann.resize_index(2 * ann.get_max_elements())
+            ann.add_items(emb[None, :], [n])
+            return
+        cache["embs"][n] = emb
+        if n + 1 >= ANN_MIN_ENTRIES:
+            cache["ann"] = _build_ann(cache["embs"][:n + 1])
+            # hnswlib keeps its own copy of the vectors; the scan array is never read again
+            cache["embs"] = None
+
+# --- Persistent Cache (Redis) ---
+# With REDIS_URL set, reports survive restarts and are shared across replicas; otherwise the in-memory cache is used
+CACHE_TTL_SECONDS = 24 * 60 * 60
+REDIS_INDEX = "matf_cache"
+REDIS_PREFIX = "matf:cache:"
+
+@st.cache_resource
+def _redis():
+    url = os.getenv("REDIS_URL")
+    if not url:
+        return None
+    import redis
+    from redis.commands.search.field import TagField, VectorField
+    try:
+        from redis.commands.search.index_definition import IndexDefinition, IndexType
+    except ImportError:  # redis-py < 6
+        from redis.commands.search.indexDefinition import IndexDefinition, IndexType
+
+    # The cache is best-effort: an unreachable server or one without RediSearch falls back to memory
+    try:
+        client = redis.Redis.from_url(url)
+        try:
+            client.ft(REDIS_INDEX).info()
+        except redis.ResponseError:
+            # "content" is stored on the hash but not indexed; it is only ever returned
+            client.ft(REDIS_INDEX).create_index(
+                fields=[
+                    TagField("agent"),
+                    VectorField("emb", "HNSW", {"TYPE": "FLOAT32", "DIM": 384, "DISTANCE_METRIC": "COSINE"}),
+                ],
+                definition=IndexDefinition(prefix=[REDIS_PREFIX], index_type=IndexType.HASH),
+            )
+    except redis.RedisError:
+        logger.exception("Redis cache unavailable; using the in-memory cache")
+        return None
+    return client
+
+def _redis_key(agent_key, topic):
+    return f"{REDIS_PREFIX}{agent_key}:{hashlib.sha256(topic.strip().lower().encode()).hexdigest()}"
+
+def _redis_lookup(client, agent_key, topic, emb):
+    from redis.commands.search.query import Query
+
+    # Exact topic first, then nearest neighbour over the HNSW index
+    content = client.hget(_redis_key(agent_key, topic), "content")
+    if content is not None:
+        return content.decode()
+    query = (
+        Query(f"(@agent:{{{agent_key}}})=>[KNN 1 @emb $vec AS dist]")
+        .return_fields("content", "dist")
+        .dialect(2)
+    )
+    docs = client.ft(REDIS_INDEX).search(query, query_params={"vec": emb.tobytes()}).docs
+    # COSINE in RediSearch is a distance, so similarity is 1 - dist
+    if docs and 1.0 - float(docs[0].dist) >= CACHE_THRESHOLD:
+        return docs[0].content
+    return None
+
+def _redis_store(client, agent_key, topic, emb, content):
+    key = _redis_key(agent_key, topic)
+    pipe = client.pipeline()
+    pipe.hset(key, mapping={"agent": agent_key, "content": content, "emb": emb.tobytes()})
+    pipe.expire(key, CACHE_TTL_SECONDS)
+    pipe.execute()
+
+def cache_lookup_many(agent_keys, topic, emb):
+    client = _redis()
+    if client is not None:
+        import redis
+        try:
+            return {key: _redis_lookup(client, key, topic, emb) for key in agent_keys}
+        except redis.RedisError:
+            logger.warning("Redis cache lookup failed; using the in-memory cache", exc_info=True)
+    return _memory_lookup_many(agent_keys, emb)
+
+def cache_store(agent_key, topic, emb, content):
+    client = _redis()
+    if client is not None:
+        import redis
+        try:
+            _redis_store(client, agent_key, topic, emb, content)
+            return
+        except redis.RedisError:
+            logger.warning("Redis cache store failed; using the in-memory cache", exc_info=True)
+    _memory_store(agent_key, emb, content)
 
 # --- Streamlit UI Config ---
 st.set_page_config(page_title="🌱 Mission Sustainability", page_icon="🌎", layout="wide")
 
-# --- Full Dark Theme Styling ---
-page_bg_color = """
+# --- Component Styling ---
+# Base colors come from the native theme in .streamlit/config.toml; only custom classes live here
+_CSS = """
 <style>
-    [data-testid="stAppViewContainer"]{
-        background-color:#121212 !important;
-        color: #f5f5f5 !important;
-    }
     aside[data-testid="stSidebar"],
     section[data-testid="stSidebar"]{
-        background: #000000 !important;
         border-right: 2px solid #222 !important;
-        color: #f5f5f5 !important;
-    }
-    [data-testid="stSidebar"] *{
-        color: #f5f5f5 !important;
     }
     .agent-box {
         background-color: #1e1e1e;
@@ -134,38 +420,33 @@ page_bg_color = """
     .sustainability-team-banner { background-color: #d32f2f; }
     textarea, input, select {
         background-color: #1e1e1e !important;
-        color: #f5f5f5 !important;
         border: 1px solid #444 !important;
         border-radius: 8px !important;
     }
+    .stButton > button,
+    .stFormSubmitButton > button {
+        border-radius: 12px;
+        font-weight: 800;
+        font-size: 18px;
+        background: linear-gradient(135deg, #2e7d32, #1b5e20);
+        color: #ffffff;
+        border: 2px solid #4caf50;
+        padding: 0.7em 1.5em;
+        box-shadow: 0 0 12px #2e7d32, 0 0 24px #1b5e20;
+        transition: all 0.3s ease-in-out;
+        text-transform: uppercase;
+        letter-spacing: 1px;
+    }
+    .stButton > button:hover,
+    .stFormSubmitButton > button:hover {
+        background: linear-gradient(135deg, #43a047, #2e7d32);
+        box-shadow: 0 0 20px #43a047, 0 0 40px #2e7d32;
+        transform: scale(1.05);
+    }
 </style>
 """
-st.markdown(page_bg_color, unsafe_allow_html=True)
-
-# --- Unique Launch Button Styling ---
-custom_button = """
-<style>
-.stButton > button {
-    border-radius: 12px;
-    font-weight: 800;
-    font-size: 18px;
-    background: linear-gradient(135deg, #2e7d32, #1b5e20);
-    color: #ffffff;
-    border: 2px solid #4caf50;
-    padding: 0.7em 1.5em;
-    box-shadow: 0 0 12px #2e7d32, 0 0 24px #1b5e20;
-    transition: all 0.3s ease-in-out;
-    text-transform: uppercase;
-    letter-spacing: 1px;
-}
-.stButton > button:hover {
-    background: linear-gradient(135deg, #43a047, #2e7d32);
-    box-shadow: 0 0 20px #43a047, 0 0 40px #2e7d32;
-    transform: scale(1.05);
-}
-</style>
-"""
-st.markdown(custom_button, unsafe_allow_html=True)
+# Streamlit drops elements that are not re-emitted on a rerun, so the style block is sent every run
+st.markdown(_CSS, unsafe_allow_html=True)
 
 # --- Title ---
 st.markdown(
@@ -210,7 +491,23 @@ st.sidebar.header("🛠️ Mission Control")
 
 # Live Mission Clock
 st.sidebar.markdown("### ⏳ Mission Time")
-st.sidebar.markdown(f"**{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}**")
+# Ticks in the browser, so the server never has to rerun to update it
+MISSION_CLOCK_HTML = """
+<div id="clk" style="font-family:sans-serif; font-weight:700; color:#f5f5f5;"></div>
+<script>
+    const pad = (n) => String(n).padStart(2, "0");
+    const tick = () => {
+        const d = new Date();
+        document.getElementById("clk").innerText =
+            `${d.getFullYear()}-${pad(d.getMonth() + 1)}-${pad(d.getDate())} ` +
+            `${pad(d.getHours())}:${pad(d.getMinutes())}:${pad(d.getSeconds())}`;
+    };
+    tick();
+    setInterval(tick, 1000);
+</script>
+"""
+with st.sidebar:
+    components.html(MISSION_CLOCK_HTML, height=30)
 
 # Divider
 st.sidebar.markdown("---")
@@ -219,7 +516,7 @@ st.sidebar.markdown("### ⚡ Choose Your Operative")
 # Agent Choice
 agent_choice = st.sidebar.radio(
     "Select your operative:",
-    ("📰 News Analyst", "📊 Data Analyst", "📜 Policy Reviewer", "💡 Innovations Scout", "🌐 Full Task Force")
+    tuple(AGENT_MAP)
 )
 
 # Sustainability Fact
@@ -232,64 +529,74 @@ facts = [
 ]
 st.sidebar.markdown("---")
 st.sidebar.markdown("### 🌟 Sustainability Fact")
-st.sidebar.info(random.choice(facts))
+if "fact" not in st.session_state:
+    st.session_state.fact = random.choice(facts)
+st.sidebar.info(st.session_state.fact)
 
 # --- Map agent choice ---
-if agent_choice == "📰 News Analyst":
-    selected_agent = news_analyst
-    banner_class = "news-analyst-banner"
-    banner_icon = "📰"
-elif agent_choice == "📊 Data Analyst":
-    selected_agent = data_analyst
-    banner_class = "data-analyst-banner"
-    banner_icon = "📊"
-elif agent_choice == "📜 Policy Reviewer":
-    selected_agent = policy_reviewer
-    banner_class = "policy-reviewer-banner"
-    banner_icon = "📜"
-elif agent_choice == "💡 Innovations Scout":
-    selected_agent = innovation_scout
-    banner_class = "innovation-scout-banner"
-    banner_icon = "💡"
-else:
-    selected_agent = sustainability_team
-    banner_class = "sustainability-team-banner"
-    banner_icon = "🌐"
+agent_key, banner_class, banner_icon = AGENT_MAP[agent_choice]
 
 # --- Main Input ---
-topic = st.text_area(
-    "🎯 Enter mission target (topic/city):",
-    placeholder="Example: Renewable energy transition in Karachi"
-)
+# Inside a form, typing does not rerun the script; only the launch button does
+with st.form("mission"):
+    topic = st.text_area(
+        "🎯 Enter mission target (topic/city):",
+        placeholder="Example: Renewable energy transition in Karachi"
+    )
+    submitted = st.form_submit_button("🚀 Launch Mission", use_container_width=True)
 
 # --- Launch Button ---
-if st.button("🚀 Launch Mission", use_container_width=True):
+if submitted:
     if topic.strip():
         mission_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         st.info(f"📅 Mission Start Time: **{mission_time}**")
+        # Formatted once per mission; streaming flushes only concatenate the content
+        banner_html = f"<div class='banner {banner_class}'>{banner_icon} {agent_choice} Report</div>"
+        banner_prefix = banner_html + "<div class='agent-box'>"
+        banner_suffix = "</div>"
         with st.spinner(f"🔍 Deploying {agent_choice}... please stand by..."):
             try:
+                placeholder = st.empty()
                 if agent_choice == "📊 Data Analyst":
-                    result_text = analyze_dataset()
-                    st.markdown(
-                        f"<div class='banner {banner_class}'>{banner_icon} {agent_choice} Report</div>"
-                        f"<div class='agent-box'>{result_text}</div>",
-                        unsafe_allow_html=True
-                    )
+                    st.session_state.pop("last_report", None)
+                    # Native metric tiles and an Arrow-backed grid instead of a markdown code block
+                    stats = dataset_aggregates()
+                    placeholder.markdown(banner_html, unsafe_allow_html=True)
+                    units = {"PM2.5": "μg/m³", "CO2": "ppm"}
+                    if len(stats.columns):
+                        for col, name in zip(st.columns(len(stats.columns)), stats.columns):
+                            col.metric(f"Avg {name}", f"{stats.at['mean', name]:.2f} {units[name]}")
+                    st.dataframe(stats, use_container_width=True)
+                    with st.expander("📈 Show full stats"):
+                        st.dataframe(dataset_stats(), use_container_width=True)
                 else:
-                    result = selected_agent.run(topic)
-                    if result and hasattr(result, "content"):
-                        st.markdown(
-                            f"<div class='banner {banner_class}'>{banner_icon} {agent_choice} Report</div>"
-                            f"<div class='agent-box'>{result.content}</div>",
-                            unsafe_allow_html=True
-                        )
+                    emb = embed_topic(topic)
+                    is_taskforce = agent_choice == "🌐 Full Task Force"
+                    # One pass over the cache covers the team report and, for the Task Force, every operative
+                    lookup_keys = (agent_key,) + (TASKFORCE_OPERATIVES if is_taskforce else ())
+                    cached = cache_lookup_many(lookup_keys, topic, emb)
+                    content = cached[agent_key]
+                    if content is None:
+                        if is_taskforce:
+                            prompt, cacheable = asyncio.run(brief_taskforce(topic, emb, cached))
+                            runner = build_agent("synthesizer")
+                        else:
+                            runner, prompt, cacheable = build_agent(agent_key), topic, True
+                        content = stream_report(runner.run(prompt, stream=True), placeholder, banner_prefix, banner_suffix)
+                        # A proposal built from the dataset alone (every operative failed) is not worth caching
+                        if content and cacheable:
+                            cache_store(agent_key, topic, emb, content)
+                    if content:
+                        placeholder.html(render_report(agent_key, topic, content, banner_prefix, banner_suffix))
                     else:
                         st.warning("⚠️ No content returned from the agent.")
             except Exception as e:
                 st.error(f"💥 Mission Error: {e}")
     else:
         st.warning("✏️ Please specify your mission target first.")
+elif "last_report" in st.session_state:
+    # Reruns (sidebar changes, etc.) keep the previous report on screen from the stored HTML
+    st.html(st.session_state.last_report["html"])
 
 # --- Footer ---
 st.markdown("---")